@@ -1,4 +1,5 @@
 import streamlit as st
+from src.facilities_helper_summary_statistics import DEFAULT_TARGETS
 from src.facilities_overview_dashboard_helper import load_data, extract_all_facility_summaries, render_facility_dashboard, render_summary_statistics
 import datetime
 import pandas as pd
@@ -9,7 +10,8 @@ import pandas as pd
 st.set_page_config(
     page_title="0_YEEAP_II_Analytics",
     layout="wide",
-    initial_sidebar_state="collapsed",  # ✅ hides sidebar initially
+    # ✅ hides sidebar until logged in, expands it afterwards
+    initial_sidebar_state="expanded" if st.session_state.get("authenticated") else "collapsed",
 )
 
 # --------------------------------------
@@ -43,31 +45,20 @@ if not st.session_state.authenticated:
 # Main App (after login)
 # --------------------------------------
 
-st.set_page_config(
-    page_title="0_YEEAP_II_Analytics",
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
 # Initialize session data
+SUMMARY_CSV = "data/facilities_summary_by_date_status_type.csv"
+
 if "df_summary" not in st.session_state:
-    st.session_state.df_summary = load_data("data/facilities_summary_by_date_status_type.csv")
+    st.session_state.df_summary = load_data(SUMMARY_CSV)
 
 
 if "targets" not in st.session_state:
-    st.session_state.targets = {
-        "Total": 700,
-        "School": 100,
-        "Clinic": 350,
-        "Well": 200,
-        "Vaccine": 50,
-    }
+    st.session_state.targets = dict(DEFAULT_TARGETS)
 
 # Retrieve
 df_summary = st.session_state.df_summary
-df_summary["date"] = pd.to_datetime(df_summary["date"], errors="coerce")
 targets = st.session_state.targets
-summaries = extract_all_facility_summaries(df_summary, targets)
+summaries = extract_all_facility_summaries(SUMMARY_CSV, tuple(sorted(targets.items())))
 latest_date = df_summary["date"].max()
 formatted_date = latest_date.strftime("%B %d, %Y") if pd.notnull(latest_date) else "Unknown"
 
@@ -7,17 +7,20 @@ from src.facilities_helper_change_log import render_facility_change_log, load_fa
 
 st.set_page_config(page_title="Facility Progress Over Time", layout="wide")
 
+
+@st.cache_data
+def latest_snapshot(df):
+    """Return the latest date and the rows recorded on it."""
+    latest_date = df["date"].max()
+    return latest_date, df[df["date"] == latest_date].reset_index(drop=True)
+
+
 # ---------------------------------------------------------------
 # Load dataset
 # ---------------------------------------------------------------
 df = load_facility_summary()
 
-# Ensure proper date handling
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
-df = df.dropna(subset=["date"])
-
-latest_date = df["date"].max()
-df_latest = df[df["date"] == latest_date].copy()
+latest_date, df_latest = latest_snapshot(df)
 
 # ---------------------------------------------------------------
 # Sidebar summary (latest snapshot)
@@ -27,8 +30,10 @@ with st.sidebar:
     st.caption(f"as of **{latest_date:%d %B %Y}**")
 
     # --- Facility summary ---
+    # status is Categorical, so this compares small integer codes, not strings
+    energized_df = df_latest[df_latest["status"] == "Energized"]
     total = int(df_latest["n_facilities"].sum()) if "n_facilities" in df_latest.columns else 0
-    energized = int(df_latest[df_latest["status"].str.lower() == "energized"]["n_facilities"].sum()) if "status" in df_latest.columns else 0
+    energized = int(energized_df["n_facilities"].sum())
     percent_energized = (energized / total * 100) if total > 0 else 0
 
     st.metric("Percent Energized", f"{percent_energized:.1f}%")
@@ -40,17 +45,20 @@ with st.sidebar:
     st.divider()
 
     # --- Beneficiary summary (Energized only) ---
-    energized_df = df_latest[df_latest["status"].str.lower() == "energized"].copy()
-
-    def safe_sum(df, col):
-        """Safely sum numeric columns, coercing non-numeric values if needed."""
-        if col not in df.columns:
-            return 0
-        return int(pd.to_numeric(df[col], errors="coerce").fillna(0).sum())
-
-    total_benef = safe_sum(energized_df, "total_beneficiaries")
-    female_benef = safe_sum(energized_df, "female_beneficiaries")
-    male_benef = safe_sum(energized_df, "male_beneficiaries")
+    # Sum all numeric sidebar columns in one pass, coercing non-numeric values
+    sum_cols = [
+        "total_beneficiaries",
+        "female_beneficiaries",
+        "male_beneficiaries",
+        "solar_capacity_kw",
+        "storage_capacity_kwh",
+    ]
+    present = [c for c in sum_cols if c in energized_df.columns]
+    sums = energized_df[present].apply(pd.to_numeric, errors="coerce").fillna(0).sum()
+
+    total_benef = int(sums.get("total_beneficiaries", 0))
+    female_benef = int(sums.get("female_beneficiaries", 0))
+    male_benef = int(sums.get("male_beneficiaries", 0))
 
     female_pct = (female_benef / total_benef * 100) if total_benef > 0 else 0
     male_pct = (male_benef / total_benef * 100) if total_benef > 0 else 0
@@ -67,8 +75,8 @@ with st.sidebar:
     st.divider()
     st.markdown("### Installed Capacity")
 
-    total_kw = safe_sum(energized_df, "solar_capacity_kw")
-    total_kwh = safe_sum(energized_df, "storage_capacity_kwh")
+    total_kw = int(sums.get("solar_capacity_kw", 0))
+    total_kwh = int(sums.get("storage_capacity_kwh", 0))
 
 
     st.metric("Solar Capacity (kW)", f"{total_kw:,.1f}")
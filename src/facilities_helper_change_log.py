@@ -1,13 +1,24 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from src.facilities_helper_summary_statistics import STATUS_ORDER, read_facility_summary
 
 @st.cache_data
 def load_facility_summary():
-    df = pd.read_csv("data/facilities_summary_by_date_status_type.csv")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    return df.dropna(subset=["date"])
+    df = read_facility_summary()
+    df = df.dropna(subset=["date"])
 
+    # Sort once so downstream groupbys see contiguous, already-ordered keys
+    return df.sort_values(["date", "type", "status"], kind="mergesort").reset_index(drop=True)
 
+
+@st.cache_data
+def _date_status_pivot(df):
+    """Facility counts per date (rows) and status (columns), built in one groupby."""
+    return df.groupby(["date", "status"], observed=True)["n_facilities"].sum().unstack("status", fill_value=0)
+
+
+@st.fragment
 def render_facility_change_log():
     df = load_facility_summary()
 
@@ -37,83 +48,51 @@ def render_facility_change_log():
         )
         date_before = date_map[date_before_label]
 
-    # --- Aggregate by status for both snapshots ---
-    latest = (
-        df[df["date"] == date_latest]
-        .groupby("status")["n_facilities"]
-        .sum()
-        .rename("Current")
-    )
-    before = (
-        df[df["date"] == date_before]
-        .groupby("status")["n_facilities"]
-        .sum()
-        .rename("Previous")
-    )
+    # --- Look up status totals for both snapshots ---
+    pivot = _date_status_pivot(df)
+    latest = pivot.loc[date_latest].rename("Current")
+    before = pivot.loc[date_before].rename("Previous")
 
     # --- Combine and compute change ---
     change_log = pd.concat([before, latest], axis=1).fillna(0)
     change_log["Change"] = change_log["Current"] - change_log["Previous"]
     change_log["% Change"] = (
-        change_log["Change"] / change_log["Previous"].replace(0, pd.NA) * 100
+        change_log["Change"] / change_log["Previous"].replace(0, np.nan) * 100
     ).round(1)
 
-    # --- Order and color by status ---
-    status_order = ["Under Design", "Tender launched", "Contract awarded", "Energized"]
-    status_colors = {
-        "Under Design": "rgba(231, 76, 60, 0.25)",      # semi-transparent red
-        "Tender launched": "rgba(230, 126, 34, 0.25)",   # semi-transparent orange
-        "Contract awarded": "rgba(241, 196, 15, 0.25)",  # semi-transparent yellow
-        "Energized": "rgba(46, 204, 113, 0.25)",         # semi-transparent green
+    # --- Order and mark by status ---
+    status_markers = {
+        "Under Design": "🟥",
+        "Tender launched": "🟧",
+        "Contract awarded": "🟨",
+        "Energized": "🟩",
     }
-    change_log = change_log.reindex(status_order)
-
-    # --- Style logic ---
-    def color_change(val):
-        if pd.isna(val):
-            return "color: gray;"
-        elif val > 0:
-            return "color: lightgreen;"
-        elif val < 0:
-            return "color: salmon;"
-        return ""
-
-    def style_index_color(index):
-        """Apply faint background color to the index column (status names)."""
-        color = status_colors.get(index, "transparent")
-        return f"background-color: {color}; font-weight: 600; color: black;"
-
-    # --- Display styled dataframe ---
-    styled = (
-        change_log.style
-        .format({
-            "Previous": "{:.0f}",
-            "Current": "{:.0f}",
-            "Change": "{:+.0f}",
-            "% Change": "{:+.1f}%"
-        })
-        .applymap(color_change, subset=["Change", "% Change"])
+    # Statuses outside STATUS_ORDER (e.g. a new one) are listed after it
+    order = STATUS_ORDER + sorted(s for s in change_log.index if s not in STATUS_ORDER)
+    change_log = change_log.reindex(order)
+    change_log.index = [f"{status_markers.get(s, '⬜')} {s}" for s in order]
+    change_log.index.name = "Status"
+
+    # --- Trend marker, computed for the whole column at once ---
+    change_log.insert(
+        0,
+        "Trend",
+        np.select([change_log["Change"] > 0, change_log["Change"] < 0], ["🔺", "🔻"], default="➖"),
     )
 
-    # Apply faint color to index (status titles)
-    styled = styled.set_table_styles([
-        {
-            "selector": "th.row_heading",
-            "props": [
-                ("text-align", "left"),
-                ("font-weight", "bold"),
-            ]
-        }
-    ])
-
-    # Custom index coloring (loop through statuses)
-    for status, color in status_colors.items():
-        styled = styled.map_index(lambda v, s=status, c=color:
-            f"background-color: {c}; color: black; font-weight: 600;"
-            if v == s else None
-        )
-
-    st.dataframe(styled, use_container_width=True, height=280)
+    # --- Display with client-side number formatting ---
+    st.dataframe(
+        change_log,
+        column_config={
+            "Trend": st.column_config.TextColumn("", width="small"),
+            "Previous": st.column_config.NumberColumn(format="%d"),
+            "Current": st.column_config.NumberColumn(format="%d"),
+            "Change": st.column_config.NumberColumn(format="%+d"),
+            "% Change": st.column_config.NumberColumn(format="%+.1f%%"),
+        },
+        use_container_width=True,
+        height=280,
+    )
 
     # --- Caption ---
     st.caption(
@@ -7,92 +7,143 @@ import plotly.graph_objects as go
 # ---------------------------------------------------------------
 # Cached data loaders
 # ---------------------------------------------------------------
-@st.cache_data
+def _simplify_coordinates(coords, precision=3):
+    """Round GeoJSON coordinates and drop consecutive duplicate points in each ring."""
+    if isinstance(coords[0], (int, float)):
+        return [round(c, precision) for c in coords]
+
+    simplified = [_simplify_coordinates(c, precision) for c in coords]
+    if isinstance(simplified[0][0], (int, float)):
+        # A ring of points: keep it closed and valid (at least 4 positions)
+        deduped = [pt for i, pt in enumerate(simplified) if i == 0 or pt != simplified[i - 1]]
+        return deduped if len(deduped) >= 4 else simplified
+    return simplified
+
+
+@st.cache_resource
 def load_yemen_boundaries():
     """Load GeoJSON and prepare a dataframe with IDs and governorate names."""
     path = "data/boundaries_adm1.geojson"
     with open(path, "r") as f:
         geojson_data = json.load(f)
 
-    # Extract governorate names
+    # Extract governorate names and shrink the polygons sent to the browser
     features = []
     for i, ftr in enumerate(geojson_data["features"]):
         gov_name = ftr["properties"].get("adm1_en", f"Unknown_{i}")
         ftr["id"] = gov_name  # Set feature 'id' for Plotly to match
+        ftr["geometry"]["coordinates"] = _simplify_coordinates(ftr["geometry"]["coordinates"])
         features.append({"governorate": gov_name})
 
     df = pd.DataFrame(features)
     return df, geojson_data
 
 
+# Marker colors by project status
+STATUS_COLORS = {
+    "Under Design": "red",
+    "Tender launched": "orange",
+    "Contract awarded": "yellow",
+    "Energized": "green",
+}
+
+# HTML legend for the marker colors, rendered as a single element
+STATUS_LEGEND_HTML = "<br>".join(
+    f"<span style='color:{color}; font-weight:700;'>●</span> {status}"
+    for status, color in STATUS_COLORS.items()
+)
+
+
 @st.cache_data
 def load_facility_sites():
-    df = pd.read_csv("data/facilities_sites_latest.csv")
-    return df.dropna(subset=["latitude", "longitude"])
+    df = pd.read_csv(
+        "data/facilities_sites_latest.csv",
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        dtype={"latitude": "float32", "longitude": "float32"},
+    )
+    df = df.dropna(subset=["latitude", "longitude"])
+
+    # Marker hover text and colors only depend on the data, so build them here
+    df["hover_text"] = (
+        "<b>Type:</b> " + df["type"].astype(str) + "<br>"
+        "<b>Status:</b> " + df["status"].astype(str)
+    )
+    df["color"] = df["status"].map(STATUS_COLORS).fillna("gray")
+
+    df["type"] = df["type"].astype("category")
+    df["status"] = df["status"].astype("category")
+    return df
 
 
 @st.cache_data
 def load_governorate_summary():
-    df = pd.read_csv("data/facilities_governorate_summary.csv")
+    df = pd.read_csv(
+        "data/facilities_governorate_summary.csv",
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+    )
     return df
 
 
-# ---------------------------------------------------------------
-# Main rendering function
-# ---------------------------------------------------------------
-def render_yemen_facility_map():
-    geo_df, geojson_data = load_yemen_boundaries()
-    df_sites = load_facility_sites()
-    df_gov = load_governorate_summary()
+# Summary-file names that differ from the GeoJSON 'adm1_en' names
+MANUAL_NAME_MAP = {
+    "Ad Dali": "Ad Dale'",
+    "Amanat Al Asimah": "Sana'a City",
+    "Ma'rib": "Marib",
+    "Taiz": "Ta'iz",
+}
+
 
-    # Normalize names between sources
-    manual_name_map = {
-        "Ad Dali": "Ad Dale'",
-        "Amanat Al Asimah": "Sana'a City",
-        "Ma'rib": "Marib",
-        "Taiz": "Ta'iz",
-    }
-    df_gov["governorate"] = df_gov["governorate"].str.strip().replace(manual_name_map)
+@st.cache_data
+def load_merged_governorates():
+    """Normalize governorate names and merge the summary onto the boundaries once."""
+    geo_df, _ = load_yemen_boundaries()
+    df_gov = load_governorate_summary()
+    df_gov["governorate"] = df_gov["governorate"].str.strip().replace(MANUAL_NAME_MAP)
 
-    # Merge
     geo = geo_df.merge(df_gov, on="governorate", how="left")
+    return geo, df_gov
 
-    # -----------------------------------------------------------
-    # User controls
-    # -----------------------------------------------------------
-    metric = st.selectbox(
-        "Select metric for governorate color:",
-        ["total_facilities", "energized_facilities", "percent_energized"],
-        index=2,
-    )
-    show_facilities = st.toggle("Show facility markers", value=True)
 
-    # -----------------------------------------------------------
-    # Color and symbol maps
-    # -----------------------------------------------------------
-    status_colors = {
-        "Under Design": "red",
-        "Tender launched": "orange",
-        "Contract awarded": "yellow",
-        "Energized": "green",
-    }
-    type_symbols = {
-        "School": "circle",
-        "Clinic": "square",
-        "Well": "triangle-up",
-        "Vaccine": "diamond",
-    }
+@st.cache_data
+def governorate_merge_diagnostics():
+    """Governorates missing from the summary, and names found in only one source."""
+    geo, df_gov = load_merged_governorates()
+    missing = geo[geo["total_facilities"].isna()][["governorate"]]
+
+    geo_names = set(geo["governorate"].dropna().str.lower())
+    data_names = set(df_gov["governorate"].dropna().str.lower())
+    return missing, sorted(geo_names - data_names), sorted(data_names - geo_names)
+
+
+# ---------------------------------------------------------------
+# Figure builder
+# ---------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def build_map_figure(metric: str, show_facilities: bool) -> go.Figure:
+    """Build the map figure for one (metric, show_facilities) choice.
+
+    Cached as a shared resource so the GeoJSON inside is not pickled per rerun;
+    callers only render the figure and must not mutate it."""
+    _, geojson_data = load_yemen_boundaries()
+    geo, _ = load_merged_governorates()
+    df_sites = load_facility_sites()
 
     # -----------------------------------------------------------
-    # Plot Yemen map
+    # Plot Yemen map (WebGL tiles via MapLibre)
     # -----------------------------------------------------------
-    fig = px.choropleth(
+    fig = px.choropleth_map(
         geo,
         geojson=geojson_data,
         locations="governorate",        # must match 'id' field in GeoJSON
         featureidkey="properties.adm1_en",  # tells Plotly which key to match
         color=metric,
         color_continuous_scale="GnBu",
+        map_style="carto-darkmatter",
+        center=dict(lat=15, lon=47.5),
+        zoom=5,
+        opacity=0.7,
         hover_name="governorate",
         hover_data={
             "total_facilities": True,
@@ -101,56 +152,30 @@ def render_yemen_facility_map():
         },
     )
 
-    fig.update_geos(
-        fitbounds="locations",
-        visible=False,
-        showland=True,
-        showcountries=True,
-        showframe=True,
-    )
-
     # -----------------------------------------------------------
     # Add facility markers
     # -----------------------------------------------------------
+    # WebGL map markers only support colored circles, so the facility
+    # type is shown in the hover text rather than as a marker symbol.
     if show_facilities:
-        for facility_type, symbol in type_symbols.items():
-            subset = df_sites[df_sites["type"] == facility_type]
-            hover_text = (
-                "<b>Type:</b> " + subset["type"].astype(str) + "<br>"
-                "<b>Status:</b> " + subset["status"].astype(str)
-            )
-            fig.add_trace(
-                go.Scattergeo(
-                    lon=subset["longitude"],
-                    lat=subset["latitude"],
-                    text=hover_text,
-                    mode="markers",
-                    marker=dict(
-                        size=5,
-                        color=subset["status"].map(status_colors).fillna("gray"),
-                        symbol=symbol,
-                        line=dict(width=0.5, color="black"),
-                    ),
-                    hoverinfo="text",
-                    hoverlabel=dict(bgcolor="black", font_size=12, font_family="Arial"),
-                    showlegend=False,   # 🔹 ensures NO legend entry
-                )
+        fig.add_trace(
+            go.Scattermap(
+                lon=df_sites["longitude"],
+                lat=df_sites["latitude"],
+                text=df_sites["hover_text"],
+                mode="markers",
+                marker=dict(size=6, color=df_sites["color"]),
+                hoverinfo="text",
+                hoverlabel=dict(bgcolor="black", font_size=12, font_family="Arial"),
+                showlegend=False,   # 🔹 ensures NO legend entry
             )
+        )
 
     # -----------------------------------------------------------
     # Layout and style
     # -----------------------------------------------------------
     fig.update_layout(
         showlegend=False,  # 🔹 disables all legends globally
-        geo=dict(
-            projection_scale=6,
-            center=dict(lat=15, lon=47.5),
-            showland=True,
-            landcolor="black",
-            bgcolor="black",
-            showocean=True,
-            oceancolor="black",
-        ),
         margin=dict(l=0, r=0, t=0, b=0),
         paper_bgcolor="black",
         plot_bgcolor="black",
@@ -167,40 +192,37 @@ def render_yemen_facility_map():
         ),
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    with st.expander("Legend (Status & Type)"):
-        col1, col2 = st.columns(2)
-
-        # Status colors (left column)
-        col1.markdown("**Project Status:**")
-        with col1.container(border=True):
-            for status, color in status_colors.items():
-                st.markdown(
-                    f"<span style='color:{color}; font-weight:700;'>●</span> {status}",
-                    unsafe_allow_html=True,
-                )
-
-        # Facility types (right column)
-        col2.markdown("**Facility Type:**")
-        with col2.container(border=True):
-            symbol_map = {
-                "circle": "●",
-                "square": "■",
-                "triangle-up": "▲",
-                "diamond": "◆",
-            }
-            for facility_type, symbol in type_symbols.items():
-                st.markdown(
-                    f"<span style='color:white;'>{symbol_map.get(symbol, '?')}</span> {facility_type}",
-                    unsafe_allow_html=True,
-                )
+    return fig
+
+
+# ---------------------------------------------------------------
+# Main rendering function
+# ---------------------------------------------------------------
+@st.fragment
+def render_yemen_facility_map():
+    # -----------------------------------------------------------
+    # User controls
+    # -----------------------------------------------------------
+    metric = st.selectbox(
+        "Select metric for governorate color:",
+        ["total_facilities", "energized_facilities", "percent_energized"],
+        index=2,
+    )
+    show_facilities = st.toggle("Show facility markers", value=True)
+
+    st.plotly_chart(build_map_figure(metric, show_facilities), use_container_width=True)
+
+    with st.expander("Legend (Status)"):
+        st.markdown("**Project Status:**")
+        with st.container(border=True):
+            st.markdown(STATUS_LEGEND_HTML, unsafe_allow_html=True)
     # -----------------------------------------------------------
     # Debugging: data comparison
     # -----------------------------------------------------------
     with st.expander("Data Debugger"):
+        missing, only_geo, only_data = governorate_merge_diagnostics()
+
         st.markdown("#### Governorate Merge Status")
-        missing = geo[geo["total_facilities"].isna()][["governorate"]]
         if missing.empty:
             st.success("✅ All governorates merged successfully.")
         else:
@@ -208,10 +230,8 @@ def render_yemen_facility_map():
             st.dataframe(missing)
 
         st.markdown("#### Unmatched Names")
-        geo_names = set(geo["governorate"].dropna().str.lower())
-        data_names = set(df_gov["governorate"].dropna().str.lower())
-        st.write("Only in GeoJSON:", sorted(geo_names - data_names))
-        st.write("Only in Summary Data:", sorted(data_names - geo_names))
+        st.write("Only in GeoJSON:", only_geo)
+        st.write("Only in Summary Data:", only_data)
 
 
 # ---------------------------------------------------------------
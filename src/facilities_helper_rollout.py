@@ -1,102 +1,125 @@
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
+from src.facilities_helper_change_log import load_facility_summary
+from src.facilities_helper_summary_statistics import (
+    DEFAULT_TARGETS,
+    FACILITY_TITLE_MAP,
+    build_status_pivots,
+)
+
+# Colors of the rollout statuses
+STATUS_COLORS = {
+    "Under Design": "red",
+    "Tender launched": "orange",
+    "Contract awarded": "yellow",
+    "Energized": "green",
+}
+
+# Hover label for each status trace (customdata holds the unstacked count)
+HOVERTEMPLATE = (
+    "<b>%{x|%d %B %Y}</b><br>"
+    "Status: %{fullData.name}<br>"
+    "Facilities: %{customdata:,}<extra></extra>"
+)
+
+
+# Above this many dates the rollout chart is resampled to coarser bins
+MAX_ROLLOUT_POINTS = 120
+
+
+def _downsample(pivoted: pd.DataFrame) -> pd.DataFrame:
+    """Resample a date x status pivot to daily/weekly/monthly bins when it is too dense."""
+    if len(pivoted) <= MAX_ROLLOUT_POINTS:
+        return pivoted
+
+    span_days = (pivoted.index[-1] - pivoted.index[0]).days
+    rule = "D" if span_days < 90 else "W" if span_days < 730 else "MS"
+    # Counts are snapshots, so keep the last real row of each bin under its own date
+    # (resample().last() would relabel it with the bin edge instead)
+    return pivoted.groupby(pd.Grouper(freq=rule)).tail(1)
+
 
 @st.cache_data
-def load_facility_summary(path="data/facilities_summary_by_date_status_type.csv"):
-    df = pd.read_csv(path)
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    return df
-
-
-FACILITY_TITLE_MAP = {
-    "Total": "All Facility Types",
-    "School": "Educational Facilities",
-    "Clinic": "Health Facilities",
-    "Well": "Water Facilities",
-    "Vaccine": "Vaccination Facilities",
-}
+def load_precomputed_rollout() -> dict:
+    """Facility counts pivoted to date x status, keyed by facility type plus "Total"."""
+    pivots = build_status_pivots(load_facility_summary())
+    return {facility_type: _downsample(p) for facility_type, p in pivots.items()}
+
+
+@st.cache_data
+def _all_rollout_pivots() -> dict:
+    """Plot-ready (counts, stacked counts) pivots for every selectable facility type."""
+    # Columns follow STATUS_ORDER (other statuses last), so a row-wise cumsum gives the stack
+    return {
+        facility_type: (pivoted, pivoted.cumsum(axis=1))
+        for facility_type, pivoted in load_precomputed_rollout().items()
+    }
 
 
 def render_facility_rollout_chart():
     # ----------------------------------------------------------------
-    # Ensure targets exist in session
+    # Targets: session overrides if set, static defaults otherwise
     # ----------------------------------------------------------------
-    if "targets" not in st.session_state:
-        st.session_state.targets = {
-            "Total": 700,
-            "School": 100,
-            "Clinic": 350,
-            "Well": 200,
-            "Vaccine": 50,
-        }
-
-    df = load_facility_summary()
+    targets = st.session_state.get("targets", DEFAULT_TARGETS)
 
     # ----------------------------------------------------------------
     # Facility Type Selector
     # ----------------------------------------------------------------
-    facility_types = ["Total"] + sorted(df["type"].dropna().unique().tolist())
+    rollout_pivots = _all_rollout_pivots()
+    facility_types = ["Total"] + sorted(k for k in rollout_pivots if k != "Total")
     selected_type = st.selectbox("Select Facility Type:", facility_types, index=0)
 
-    # Filter if not total
-    if selected_type != "Total":
-        df = df[df["type"] == selected_type]
-
-    # ----------------------------------------------------------------
-    # Aggregate by date & status
     # ----------------------------------------------------------------
-    grouped = (
-        df.groupby(["date", "status"], dropna=False)
-          .agg(n_facilities=("n_facilities", "sum"))
-          .reset_index()
-          .dropna(subset=["date"])
-    )
-
+    # Date x status counts and their stack, precomputed for every type
     # ----------------------------------------------------------------
-    # Define color map and stacking order
-    # ----------------------------------------------------------------
-    status_order = ["Under Design", "Tender launched", "Contract awarded", "Energized"]
-    status_colors = {
-        "Under Design": "red",
-        "Tender launched": "orange",
-        "Contract awarded": "yellow",
-        "Energized": "green",
-    }
-
-    grouped["status"] = pd.Categorical(grouped["status"], categories=status_order, ordered=True)
-    grouped = grouped.sort_values(["date", "status"])
+    pivoted, stacked = rollout_pivots[selected_type]
 
     # ----------------------------------------------------------------
     # Get target from session
     # ----------------------------------------------------------------
-    target_value = st.session_state.targets.get(selected_type, st.session_state.targets["Total"])
+    target_value = targets.get(selected_type, targets["Total"])
     title_text = FACILITY_TITLE_MAP.get(selected_type, selected_type)
 
     # ----------------------------------------------------------------
     # Plot the chart
     # ----------------------------------------------------------------
-    fig = px.area(
-        grouped,
-        x="date",
-        y="n_facilities",
-        color="status",
-        category_orders={"status": status_order},
-        color_discrete_map=status_colors,
-        title=f"Facility Rollout Progress — {title_text}",
-    )
+    # WebGL traces have no stackgroup, so stack the cumulative totals by hand
+    # and carry each status' own count in customdata for the hover.
+    fig = go.Figure()
+    for status in pivoted.columns:
+        fig.add_trace(
+            go.Scattergl(
+                x=pivoted.index,
+                y=stacked[status],
+                customdata=pivoted[status],
+                name=status,
+                mode="lines",
+                fill="tonexty",
+                line=dict(color=STATUS_COLORS.get(status, "gray")),
+                hovertemplate=HOVERTEMPLATE,
+            )
+        )
 
-    # --- Hover styling ---
-    hovertemplate = (
-        "<b>%{x|%d %B %Y}</b><br>"
-        "Status: %{fullData.name}<br>"
-        "Facilities: %{y:,}<extra></extra>"
-    )
-    fig.update_traces(
-        mode="lines+markers",
-        hovertemplate=hovertemplate,
-        marker=dict(size=5, line=dict(width=0.5, color="black")),
-    )
+    # --- Emphasize only the latest point of each series (one small trace) ---
+    if len(stacked):
+        latest = stacked.iloc[-1]
+        fig.add_trace(
+            go.Scattergl(
+                x=[stacked.index[-1]] * len(latest),
+                y=latest.to_numpy(),
+                mode="markers",
+                marker=dict(
+                    size=6,
+                    color=[STATUS_COLORS.get(s, "gray") for s in latest.index],
+                    line=dict(width=0.5, color="black"),
+                ),
+                hoverinfo="skip",
+                showlegend=False,
+            )
+        )
+
+    fig.update_layout(title=f"Facility Rollout Progress — {title_text}")
 
     # ----------------------------------------------------------------
     # Add target line + annotation
@@ -118,7 +141,8 @@ def render_facility_rollout_chart():
     # ----------------------------------------------------------------
     # Layout and styling
     # ----------------------------------------------------------------
-    x_min, x_max = grouped["date"].min(), grouped["date"].max()
+    # The pivot index is sorted by date, so the ends give the range directly
+    x_min, x_max = pivoted.index[0], pivoted.index[-1]
     padding_days = pd.Timedelta(days=5)
 
     fig.update_layout(
@@ -1,26 +1,81 @@
 import pandas as pd
 
-def extract_facility_summary(df, facility_type, targets):
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"])
+# Stacking order of the rollout statuses
+STATUS_ORDER = ["Under Design", "Tender launched", "Contract awarded", "Energized"]
 
-    # --- Filter by type if not "Total"
-    if facility_type.lower() != "total":
-        df = df[df["type"].str.lower() == facility_type.lower()]
 
-    # --- Group by date and status
-    grouped = (
-        df.groupby(["date", "status"])["n_facilities"]
+# Column dtypes of the facility summary CSV, shared by every loader of it
+SUMMARY_DTYPES = {
+    "date": "string",  # parsed below so malformed dates coerce to NaT
+    "status": "category",  # open set: unknown statuses are kept, ordered after STATUS_ORDER
+    "type": "category",
+    "n_facilities": "Int32",  # nullable, so blank counts read as NA
+}
+
+
+def read_facility_summary(path="data/facilities_summary_by_date_status_type.csv"):
+    """Read the facility summary CSV with SUMMARY_DTYPES; unparseable dates become NaT."""
+    df = pd.read_csv(path, engine="pyarrow", dtype_backend="pyarrow", dtype=SUMMARY_DTYPES)
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce", cache=True)
+    return df
+
+
+# Default facility targets, per type and overall
+DEFAULT_TARGETS = {
+    "Total": 700,
+    "School": 100,
+    "Clinic": 350,
+    "Well": 200,
+    "Vaccine": 50,
+}
+
+
+FACILITY_TITLE_MAP = {
+    "Total": "All Facility Types",
+    "School": "Educational Facilities",
+    "Clinic": "Health Facilities",
+    "Well": "Water Facilities",
+    "Vaccine": "Vaccination Facilities",
+}
+
+
+def build_status_pivots(df):
+    """Pivot facility counts to date x status, keyed by facility type plus "Total"."""
+    # --- Dates are parsed at load; only convert (and copy) if they are not
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df = df.assign(date=pd.to_datetime(df["date"], errors="coerce"))
+    df = df.dropna(subset=["date"])
+
+    # --- One groupby over every type, then slice per type instead of re-grouping.
+    # sort=True keeps the dates of each type in order.
+    pivot = (
+        df.groupby(["type", "date", "status"], sort=True, observed=True)["n_facilities"]
         .sum()
-        .unstack(fill_value=0)
-        .sort_index()
+        .unstack("status", fill_value=0)
     )
+    # Statuses in STATUS_ORDER first, then any other status (e.g. a new one) after them
+    pivot = pivot[
+        [s for s in STATUS_ORDER if s in pivot.columns]
+        + sorted(s for s in pivot.columns if s not in STATUS_ORDER)
+    ]
 
+    pivots = {"Total": pivot.groupby(level="date").sum()}
+    for facility_type, sub in pivot.groupby(level="type", observed=True):
+        sub = sub.droplevel("type")
+        pivots[facility_type] = sub.loc[:, sub.any()]  # drop statuses this type never had
+    return pivots
+
+
+def extract_facility_summary(grouped, facility_type, targets):
+    """Summarize one facility type from its date x status pivot (see build_status_pivots)."""
     # --- Extract trends ---
-    energized_trend = grouped.get("Energized", pd.Series([0]*len(grouped)))
+    total_trend = grouped.sum(axis=1)
+    if "Energized" in grouped.columns:
+        energized_trend = grouped["Energized"]
+    else:
+        energized_trend = pd.Series(0, index=grouped.index)
     # Anything not 'Energized' counts as 'not energized'
-    not_energized_trend = grouped.drop(columns=["Energized"], errors="ignore").sum(axis=1)
-    dates = grouped.index.tolist()
+    not_energized_trend = total_trend - energized_trend
 
     # --- Compute latest snapshot ---
     target = targets.get(facility_type, targets.get("Total", 0))
@@ -43,6 +98,6 @@ def extract_facility_summary(df, facility_type, targets):
         "planned": planned,
         "percent": round(percent, 3),
         "increase": int(increase),
-        "energized_trend": energized_trend.tolist(),
-        "dates": [d.strftime("%Y-%m-%d") for d in dates],
+        "energized_trend": energized_trend.to_numpy().tolist(),
+        "dates": grouped.index.strftime("%Y-%m-%d").tolist(),
     }
@@ -1,41 +1,57 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from src.facilities_helper_summary_statistics import extract_facility_summary
+from src.facilities_helper_summary_statistics import (
+    FACILITY_TITLE_MAP,
+    build_status_pivots,
+    extract_facility_summary,
+    read_facility_summary,
+)
 
 
 # ----------------------------------------------------------
 # Cached Data Loader
-@st.cache_data
+@st.cache_data(show_spinner=False)
 def load_data(path: str):
     path = Path(path)
-    if not path.exists():
+    suffix = path.suffix.lower()  # accept .CSV / .XLSX as well
+    try:
+        if suffix == ".csv":
+            # Same dtypes and date coercion as the other summary loaders
+            return read_facility_summary(path)
+        elif suffix == ".xlsx":
+            # pandas opens openpyxl workbooks read-only / values-only by default
+            df = pd.read_excel(path, engine="openpyxl")
+        elif suffix == ".xls":
+            df = pd.read_excel(path)
+        else:
+            st.error(f"Unsupported file type: {path.suffix}")
+            return None
+    except FileNotFoundError:
         st.error(f"File not found: {path}")
         return None
-    if path.suffix == ".csv":
-        return pd.read_csv(path)
-    elif path.suffix in [".xlsx", ".xls"]:
-        return pd.read_excel(path)
-    else:
-        st.error(f"Unsupported file type: {path.suffix}")
-        return None
+
+    # Parse dates once here so the cached frame already holds datetime64
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce", format="%Y-%m-%d", cache=True)
+    return df
 
 
 # ----------------------------------------------------------
 # Summaries Extractor
-@st.cache_data
-def extract_all_facility_summaries(df, targets):
+@st.cache_data(show_spinner=False)
+def extract_all_facility_summaries(csv_path, targets):
+    """Keyed on the data path and a tuple of (type, target) pairs so the cache key
+    hashes cheaply; the frame itself comes from the cached `load_data`."""
+    df = load_data(csv_path)
+    targets = dict(targets)
     facility_types = ["School", "Clinic", "Well", "Vaccine"]
-    FACILITY_TITLE_MAP = {
-        "School": "Educational Facilities",
-        "Clinic": "Health Facilities",
-        "Well": "Water Facilities",
-        "Vaccine": "Vaccination Facilities",
-    }
+
+    pivots = build_status_pivots(df)
 
     summaries = {}
     for ftype in facility_types:
-        s = extract_facility_summary(df, ftype, targets)
+        s = extract_facility_summary(pivots.get(ftype, pd.DataFrame(index=pd.DatetimeIndex([]))), ftype, targets)
         s["title"] = FACILITY_TITLE_MAP.get(ftype, ftype)
         summaries[ftype] = s
 
@@ -91,18 +107,18 @@ def render_facility_dashboard(summaries):
 # Dashboard Rendering Logic
 def render_summary_statistics(df):
     """Display total summary statistics for latest date."""
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    latest_date = df["date"].max()
-
-    # Filter latest and energized
-    latest_df = df[df["date"] == latest_date]
-    energized_df = latest_df[latest_df["status"].str.lower() == "energized"]
-
-    # Totals
-    total_facilities = energized_df["n_facilities"].sum()
-    total_beneficiaries = energized_df["total_beneficiaries"].sum()
-    total_solar_kw = energized_df["solar_capacity_kw"].sum()
-    total_storage_kwh = energized_df["storage_capacity_kwh"].sum()
+    # Energized rows on the latest date (status values are clean, no lowercasing)
+    energized_mask = df["date"].eq(df["date"].max()) & df["status"].eq("Energized")
+
+    # Totals in one column-wise reduction
+    totals = df.loc[
+        energized_mask,
+        ["n_facilities", "total_beneficiaries", "solar_capacity_kw", "storage_capacity_kwh"],
+    ].sum()
+    total_facilities = totals["n_facilities"]
+    total_beneficiaries = totals["total_beneficiaries"]
+    total_solar_kw = totals["solar_capacity_kw"]
+    total_storage_kwh = totals["storage_capacity_kwh"]
 
     # Render metrics
     with st.container(border=True):